@@ -45,7 +45,10 @@ class CarepointBinding(models.AbstractModel):
         default=lambda s: s._default_backend_id(),
     )
     # fields.Char because 0 is a valid Carepoint ID
-    carepoint_id = fields.Char(string='ID on Carepoint')
+    carepoint_id = fields.Char(
+        string='ID on Carepoint',
+        index=True,
+    )
     created_at = fields.Date('Created At (on Carepoint)')
     updated_at = fields.Date('Updated At (on Carepoint)')
 
@@ -7,6 +7,7 @@ from . import carepoint_backend
 
 # Base Models
 from . import res_users
+from . import res_country_state
 from . import sale_order
 from . import sale_order_line
 from . import procurement_order
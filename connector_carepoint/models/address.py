@@ -156,14 +156,13 @@ class CarepointAddressImportMapper(CarepointImportMapper):
 
     @mapping
     def state_id(self, record):
-        state_id = self.env['res.country.state'].search([
-            ('code', '=', record['state_cd'].strip()),
-        ],
-            limit=1
+        state_obj = self.env['res.country.state']
+        state_id, country_id = state_obj._get_carepoint_state(
+            (record['state_cd'] or '').strip(),
         )
         return {
-            'state_id': state_id.id,
-            'country_id': state_id.country_id.id,
+            'state_id': state_id,
+            'country_id': country_id,
         }
 
     @mapping
@@ -4,13 +4,16 @@
 
 import logging
 import pytz
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 from odoo.addons.connector.session import ConnectorSession
 from odoo.addons.base.res.res_partner import _tz_get
 from ..unit.import_synchronizer import (import_batch,
-                                        import_record,
+                                        import_records,
+                                        iter_chunks,
                                         DirectBatchImporter,
                                         )
 from ..backend import carepoint
@@ -23,6 +26,11 @@ except ImportError:
     _logger.warning('Cannot import CarePoint')
 
 IMPORT_DELTA_BUFFER = 30  # seconds
+METADATA_SYNC_TTL = 60  # seconds
+CP_VERSIONS = [('2.99', '2.99+')]
+
+# Last metadata synchronization, keyed by ``(dbname, backend_id)``
+_metadata_synced_at = {}
 
 
 class CarepointBackend(models.Model):
@@ -43,11 +51,9 @@ class CarepointBackend(models.Model):
         selection='select_versions',
         required=True
     )
-    db_driver = fields.Selection([
-        (CarepointDb.ODBC_DRIVER, 'Production'),
-        (CarepointDb.SQLITE, 'Testing'),
-    ],
-        default=CarepointDb.ODBC_DRIVER,
+    db_driver = fields.Selection(
+        selection='select_db_drivers',
+        default=lambda s: s.select_db_drivers()[0][0],
     )
     db_pool_size = fields.Integer(
         required=True,
@@ -64,6 +70,17 @@ class CarepointBackend(models.Model):
         default=30,
         help='This is passed to SQLAlchemy `create_engine`',
     )
+    db_pool_recycle = fields.Integer(
+        required=True,
+        default=3600,
+        help='Seconds after which pooled connections are replaced. '
+             'This is passed to SQLAlchemy `create_engine`',
+    )
+    db_pool_pre_ping = fields.Boolean(
+        default=True,
+        help='Test pooled connections for liveness before using them. '
+             'This is passed to SQLAlchemy `create_engine`',
+    )
     server = fields.Char(
         required=True,
         help="IP/DNS to Carepoint database",
@@ -215,12 +232,13 @@ class CarepointBackend(models.Model):
     @api.multi
     @api.constrains('is_default', 'company_id')
     def _check_default_for_company(self):
-        for rec_id in self:
+        for rec_id in self.filtered('is_default'):
             domain = [
+                ('id', '!=', rec_id.id),
                 ('company_id', '=', rec_id.company_id.id),
                 ('is_default', '=', True),
             ]
-            if len(self.search(domain)) > 1:
+            if self.search_count(domain):
                 raise ValidationError(_(
                     'This company already has a default CarePoint connector.',
                 ))
@@ -231,6 +249,11 @@ class CarepointBackend(models.Model):
             self.env.cr, self.env.uid, context=self.env.context
         )
 
+    @api.model
+    def _cron_backends(self):
+        """ Return the active backends that scheduled imports run on """
+        return self.search([('active', '=', True)])
+
     @api.model
     def select_versions(self):
         """ Available versions in the backend.
@@ -238,12 +261,60 @@ class CarepointBackend(models.Model):
         to add a version from an ``_inherit`` does not constrain
         to redefine the ``version`` field in the ``_inherit`` model.
         """
-        return [('2.99', '2.99+')]
+        return list(CP_VERSIONS)
+
+    @api.model
+    def select_db_drivers(self):
+        """ Available database drivers for the CarePoint connection.
+        They are read from the CarePoint library when the field is used,
+        rather than when this module is loaded.
+        """
+        return [
+            (CarepointDb.ODBC_DRIVER, 'Production'),
+            (CarepointDb.SQLITE, 'Testing'),
+        ]
+
+    @api.multi
+    def _get_engine_args(self):
+        """ It returns the connection pool arguments for the CarePoint DB
+        Returns:
+            ``dict`` of kwargs for SQLAlchemy ``create_engine``. Empty for
+            SQLite, which does not use a sized connection pool.
+        """
+        self.ensure_one()
+        if self.db_driver == CarepointDb.SQLITE:
+            return {}
+        return {
+            'pool_size': self.db_pool_size,
+            'max_overflow': self.db_max_overflow,
+            'pool_timeout': self.db_pool_timeout,
+            'pool_recycle': self.db_pool_recycle,
+            'pool_pre_ping': self.db_pool_pre_ping,
+        }
 
     @api.multi
     def check_carepoint_structure(self):
-        """ Used in each data import """
-        self.synchronize_metadata()
+        """ Used in each data import
+        Metadata is synchronized at most once per ``METADATA_SYNC_TTL``
+        for each backend, counted from the commit of the last sync, so
+        fanned out imports do not repeat it.
+        """
+        now = time.time()
+        dbname = self.env.cr.dbname
+        stale = self.filtered(
+            lambda r: now - _metadata_synced_at.get((dbname, r.id), 0) >=
+            METADATA_SYNC_TTL
+        )
+        if stale:
+            stale.synchronize_metadata()
+            keys = [(dbname, backend.id) for backend in stale]
+
+            def mark_synced():
+                for key in keys:
+                    _metadata_synced_at[key] = now
+
+            # Only skip later syncs once the imported stores are committed
+            self.env.cr.after('commit', mark_synced)
         return True
 
     @api.multi
@@ -260,11 +331,15 @@ class CarepointBackend(models.Model):
         return True
 
     @api.multi
-    def _import_all(self, model):
+    def _import_all(self, *model_names):
+        """ Delay a batch import of every given model on each backend
+        The structure is checked once per backend for all of the models.
+        """
         session = self.__get_model_session()
         for backend in self:
             backend.check_carepoint_structure()
-            import_batch.delay(session, model, backend.id)
+            for model_name in model_names:
+                import_batch.delay(session, model_name, backend.id)
 
     @api.multi
     def _import_from_date(self, model, from_date_field,
@@ -302,27 +377,44 @@ class CarepointBackend(models.Model):
 
     @api.model
     def resync_all(self, binding_model):
-        """ Resync all bindings for model """
+        """ Resync all bindings for model
+        Bindings are grouped by backend and imported in chunks, with one
+        delayed job per chunk.
+        """
         session = self.__get_model_session()
-        for record_id in self.env[binding_model].search([]):
-            for binding_id in record_id.carepoint_bind_ids:
-                import_record.delay(session,
-                                    binding_model,
-                                    binding_id.backend_id.id,
-                                    binding_id.carepoint_id,
-                                    force=True,
-                                    )
+        carepoint_ids = defaultdict(list)
+        bindings = self.env[binding_model].search_read(
+            [('carepoint_id', '!=', False)], ['backend_id', 'carepoint_id'],
+        )
+        for binding in bindings:
+            carepoint_ids[binding['backend_id'][0]].append(
+                binding['carepoint_id'],
+            )
+        for backend_id, backend_carepoint_ids in carepoint_ids.items():
+            for chunk in iter_chunks(backend_carepoint_ids):
+                import_records.delay(session,
+                                     binding_model,
+                                     backend_id,
+                                     chunk,
+                                     force=True,
+                                     )
 
     @api.model
-    def force_sync(self, binding_model, remote_pk, backend_id):
-        """ Force sycronization based on model and primary key """
+    def force_sync(self, binding_model, remote_pks, backend_id):
+        """ Force sycronization based on model and primary key(s)
+        ``remote_pks`` can be a single primary key or a list of them,
+        which are imported in chunks with one delayed job per chunk.
+        """
+        if not isinstance(remote_pks, (list, tuple)):
+            remote_pks = [remote_pks]
         session = self.__get_model_session()
-        import_record.delay(session,
-                            binding_model,
-                            backend_id,
-                            remote_pk,
-                            force=True,
-                            )
+        for chunk in iter_chunks(list(remote_pks)):
+            import_records.delay(session,
+                                 binding_model,
+                                 backend_id,
+                                 chunk,
+                                 force=True,
+                                 )
 
     @api.multi
     def import_carepoint_item(self):
@@ -338,7 +430,7 @@ class CarepointBackend(models.Model):
 
     @api.model
     def cron_import_medical_patient(self):
-        self.search([]).import_medical_patient()
+        self._cron_backends().import_medical_patient()
 
     @api.multi
     def import_medical_physician(self):
@@ -348,7 +440,7 @@ class CarepointBackend(models.Model):
 
     @api.model
     def cron_import_medical_physician(self):
-        self.search([]).import_medical_physician()
+        self._cron_backends().import_medical_physician()
 
     @api.multi
     def import_medical_prescription(self):
@@ -358,7 +450,7 @@ class CarepointBackend(models.Model):
 
     @api.model
     def cron_import_medical_prescription(self):
-        self.search([]).import_medical_prescription()
+        self._cron_backends().import_medical_prescription()
 
     @api.multi
     def import_sale_order(self):
@@ -367,7 +459,7 @@ class CarepointBackend(models.Model):
 
     @api.model
     def cron_import_sale_order(self):
-        self.search([]).import_sale_order()
+        self._cron_backends().import_sale_order()
 
     @api.multi
     def import_stock_picking(self):
@@ -387,7 +479,7 @@ class CarepointBackend(models.Model):
 
     @api.model
     def cron_import_address(self):
-        self.search([]).import_address()
+        self._cron_backends().import_address()
 
     @api.multi
     def import_phone(self):
@@ -396,21 +488,23 @@ class CarepointBackend(models.Model):
 
     @api.model
     def cron_import_phone(self):
-        self.search([]).import_phone()
+        self._cron_backends().import_phone()
 
     @api.multi
     def import_fdb(self):
-        # self._import_all('carepoint.fdb.img.mfg')
-        # self._import_all('carepoint.fdb.img.date')
-        # self._import_all('carepoint.fdb.img.id')
-        # self._import_all('carepoint.fdb.img')
-        self._import_all('carepoint.fdb.route')
-        self._import_all('carepoint.fdb.form')
-        self._import_all('carepoint.fdb.unit')
-        # self._import_all('carepoint.fdb.gcn')
-        # self._import_all('carepoint.fdb.lbl.rid')
-        # self._import_all('carepoint.fdb.ndc')
-        # self._import_all('carepoint.fdb.gcn.seq')
+        self._import_all(
+            # 'carepoint.fdb.img.mfg',
+            # 'carepoint.fdb.img.date',
+            # 'carepoint.fdb.img.id',
+            # 'carepoint.fdb.img',
+            'carepoint.fdb.route',
+            'carepoint.fdb.form',
+            'carepoint.fdb.unit',
+            # 'carepoint.fdb.gcn',
+            # 'carepoint.fdb.lbl.rid',
+            # 'carepoint.fdb.ndc',
+            # 'carepoint.fdb.gcn.seq',
+        )
         return True
 
 
@@ -59,14 +59,6 @@ class MedicalUserBatchImporter(DelayedBatchImporter):
     """
     _model_name = ['carepoint.res.users']
 
-    def run(self, filters=None):
-        """ Run the synchronization """
-        if filters is None:
-            filters = {}
-        record_ids = self.backend_adapter.search(**filters)
-        for record_id in record_ids:
-            self._import_record(record_id)
-
 
 @carepoint
 class MedicalUserImportMapper(ImportMapper):
@@ -60,12 +60,9 @@ class FdbImgImportMapper(CarepointImportMapper):
     _model_name = 'carepoint.fdb.img'
     direct = [
         (trim('IMGFILENM'), 'name'),
+        ('data', 'datas'),
     ]
 
-    @mapping
-    def datas(self, record):
-        return {'datas': record['data']}
-
     @mapping
     def mimetype(self, record):
         return {'mimetype': 'image/jpeg'}
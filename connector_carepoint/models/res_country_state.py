@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015-2016 LasLabs Inc.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+from odoo import models, api, tools
+
+
+class ResCountryState(models.Model):
+    _inherit = 'res.country.state'
+
+    @api.model
+    @tools.ormcache('code')
+    def _get_carepoint_state(self, code):
+        """ It returns the state & country ids for a CarePoint state code
+        The result is cached per process until states are changed, so
+        address imports do not search the states for every record.
+        Params:
+            code: ``str`` of the state code
+        Returns:
+            ``tuple`` of ``(state_id, country_id)``, ``False`` if not found
+        """
+        state = self.search([('code', '=', code)], limit=1)
+        return state.id, state.country_id.id
+
+    @api.model
+    def create(self, vals):
+        self.clear_caches()
+        return super(ResCountryState, self).create(vals)
+
+    @api.multi
+    def write(self, vals):
+        self.clear_caches()
+        return super(ResCountryState, self).write(vals)
+
+    @api.multi
+    def unlink(self):
+        self.clear_caches()
+        return super(ResCountryState, self).unlink()
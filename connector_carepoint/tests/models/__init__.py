@@ -21,6 +21,8 @@ from . import test_carepoint_item
 from . import test_carepoint_vendor
 from . import test_carepoint_account
 
+from . import test_res_country_state
+
 from . import test_address_abstract
 from . import test_address
 from . import test_address_patient
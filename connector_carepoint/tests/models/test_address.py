@@ -62,6 +62,25 @@ class TestCarepointAddressImportMapper(CarepointAddressTestBase):
         res = self.unit.state_id(self.record)
         self.assertDictEqual(expect, res)
 
+    def test_state_id_no_match(self):
+        """ It should return False state and country on unknown code """
+        self.record['state_cd'] = 'NOT A STATE'
+        expect = {
+            'state_id': False,
+            'country_id': False,
+        }
+        res = self.unit.state_id(self.record)
+        self.assertDictEqual(expect, res)
+
+    def test_state_id_cached_lookup(self):
+        """ It should use the cached state lookup """
+        State = self.env['res.country.state'].__class__
+        with mock.patch.object(State, '_get_carepoint_state') as mk:
+            mk.return_value = (1, 2)
+            res = self.unit.state_id(self.record)
+            mk.assert_called_once_with(self.state.code)
+            self.assertDictEqual({'state_id': 1, 'country_id': 2}, res)
+
     def test_carepoint_id(self):
         """ It should return correct attribute """
         res = self.unit.carepoint_id(self.record)
@@ -48,10 +48,9 @@ class TestFdbImgImportMapper(FdbImgTestBase):
         self.assertDictEqual(expect, res)
 
     def test_datas(self):
-        """ It should return correct attribute """
-        expect = {'datas': self.record['data']}
-        res = self.unit.datas(self.record)
-        self.assertDictEqual(expect, res)
+        """ It should map the encoded image data to datas """
+        res = self.unit.map_record(self.record).values()
+        self.assertEqual(self.record['data'], res['datas'])
 
     def test_mimetype(self):
         """ It should return correct attribute """
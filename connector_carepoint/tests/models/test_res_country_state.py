@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015-2016 LasLabs Inc.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import mock
+
+from ..common import SetUpCarepointBase
+
+
+class TestResCountryState(SetUpCarepointBase):
+
+    def setUp(self):
+        super(TestResCountryState, self).setUp()
+        self.Model = self.env['res.country.state']
+        self.state = self.env.ref('base.state_us_23')
+        self.Model.clear_caches()
+
+    def tearDown(self):
+        self.Model.clear_caches()
+        super(TestResCountryState, self).tearDown()
+
+    def test_get_carepoint_state(self):
+        """ It should return the state and country ids for the code """
+        self.assertEqual(
+            (self.state.id, self.state.country_id.id),
+            self.Model._get_carepoint_state(self.state.code),
+        )
+
+    def test_get_carepoint_state_no_match(self):
+        """ It should return False ids for an unknown code """
+        self.assertEqual(
+            (False, False),
+            self.Model._get_carepoint_state('NOT A STATE'),
+        )
+
+    def test_get_carepoint_state_cached(self):
+        """ It should only search once per code """
+        with mock.patch.object(self.Model.__class__, 'search') as mk:
+            self.Model._get_carepoint_state(self.state.code)
+            self.Model._get_carepoint_state(self.state.code)
+            mk.assert_called_once_with(
+                [('code', '=', self.state.code)], limit=1,
+            )
+
+    def test_write_clears_cache(self):
+        """ It should search again after a state is written """
+        self.Model._get_carepoint_state(self.state.code)
+        self.state.write({'name': 'Test State'})
+        with mock.patch.object(self.Model.__class__, 'search') as mk:
+            self.Model._get_carepoint_state(self.state.code)
+            mk.assert_called_once_with(
+                [('code', '=', self.state.code)], limit=1,
+            )
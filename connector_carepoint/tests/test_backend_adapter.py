@@ -2,6 +2,7 @@
 # Copyright 2015-2016 LasLabs Inc.
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+import base64
 import mock
 
 from odoo.addons.connector_carepoint.unit import backend_adapter
@@ -152,24 +153,17 @@ class TestBackendAdapter(SetUpCarepointBase):
         """ It should get proper file path from server """
         with self.mock_api() as api:
             expect = '/path/to/obj'
+            api().get_file().read.return_value = ''
+            api().get_file.reset_mock()
             self._init_model().read_image(expect)
             api().get_file.assert_called_once_with(expect)
 
-    def test_read_image_encodes_file_obj(self):
-        """ It should base64 encode the resulting file obj """
-        with self.mock_api() as api:
-            self._init_model().read_image('/path/to/obj')
-            api().get_file().read().encode.assert_called_once_with(
-                'base64',
-            )
-
     def test_read_image_returns_encoded_file(self):
-        """ It should return the encoded file string """
+        """ It should return the base64 encoded file string """
         with self.mock_api() as api:
+            api().get_file().read.return_value = 'abcdefg'
             res = self._init_model().read_image('/path/to/obj')
-            self.assertEqual(
-                api().get_file().read().encode(), res,
-            )
+            self.assertEqual(base64.b64encode('abcdefg'), res)
 
     def test_write_image_sends_file(self):
         """ It should send file obj to proper path on server """
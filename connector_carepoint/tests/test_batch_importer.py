@@ -72,6 +72,16 @@ class TestBatchImporter(SetUpCarepointBase):
                     expect[0]
                 )
 
+    def test_run_import_record_ids(self):
+        """ It should pass the search results to the import hook """
+        expect = ['expect']
+        importer = self._new_importer()
+        with self.mock_adapter(importer):
+            with mock.patch.object(importer, '_import_record_ids') as mk:
+                importer.backend_adapter.search.return_value = expect
+                importer.run()
+                mk.assert_called_once_with(expect)
+
     def test_import_record(self):
         """ It should raise NotImplemented on base class """
         importer = self._new_importer()
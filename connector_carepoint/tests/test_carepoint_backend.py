@@ -6,13 +6,15 @@ import mock
 import pytz
 from datetime import timedelta, datetime
 
-from .common import SetUpCarepointBase
+from .common import SetUpCarepointBase, CarepointDb
 
 from odoo import fields
 from odoo.exceptions import ValidationError
 
 from odoo.addons.connector_carepoint.models.carepoint_backend import (
-    IMPORT_DELTA_BUFFER
+    CP_VERSIONS,
+    IMPORT_DELTA_BUFFER,
+    METADATA_SYNC_TTL,
 )
 
 
@@ -33,6 +35,14 @@ class TestCarepointBackend(SetUpCarepointBase):
                 'rx_prefix': 'RXTEST',
             })
 
+    def test_check_default_for_company_not_default(self):
+        """ It should allow non-default backends for the same company """
+        self.backend.copy({
+            'sale_prefix': 'TEST',
+            'rx_prefix': 'RXTEST',
+            'is_default': False,
+        })
+
     def test_select_versions(self):
         """ It should return proper versions """
         self.assertEqual(
@@ -40,6 +50,44 @@ class TestCarepointBackend(SetUpCarepointBase):
             self.Model.select_versions(),
         )
 
+    def test_select_versions_copy(self):
+        """ It should not expose the module level versions to changes """
+        self.Model.select_versions().append(('test', 'Test'))
+        self.assertEqual(CP_VERSIONS, self.Model.select_versions())
+
+    def test_select_db_drivers(self):
+        """ It should return the CarePoint drivers """
+        self.assertEqual(
+            [(CarepointDb.ODBC_DRIVER, 'Production'),
+             (CarepointDb.SQLITE, 'Testing'),
+             ],
+            self.Model.select_db_drivers(),
+        )
+
+    def test_db_driver_default(self):
+        """ It should default to the production driver """
+        self.assertEqual(
+            CarepointDb.ODBC_DRIVER,
+            self.Model.default_get(['db_driver'])['db_driver'],
+        )
+
+    def test_get_engine_args_sqlite(self):
+        """ It should not return pool args for SQLite """
+        self.assertDictEqual({}, self.backend._get_engine_args())
+
+    def test_get_engine_args(self):
+        """ It should return the pool args for the backend """
+        self.backend.db_driver = CarepointDb.ODBC_DRIVER
+        self.assertDictEqual({
+            'pool_size': self.backend.db_pool_size,
+            'max_overflow': self.backend.db_max_overflow,
+            'pool_timeout': self.backend.db_pool_timeout,
+            'pool_recycle': self.backend.db_pool_recycle,
+            'pool_pre_ping': self.backend.db_pool_pre_ping,
+        },
+            self.backend._get_engine_args(),
+        )
+
     @mock.patch('%s.import_batch' % model)
     @mock.patch('%s.ConnectorSession' % model)
     def test_synchronize_metadata_imports_pharmacy(self, session, batch):
@@ -49,6 +97,51 @@ class TestCarepointBackend(SetUpCarepointBase):
             session(), 'carepoint.carepoint.store', self.backend.id,
         )
 
+    def _commit_after(self, event, func):
+        """ Run commit handlers right away, as if the cursor committed """
+        func()
+
+    @mock.patch('%s.time' % model)
+    def test_check_carepoint_structure_cached(self, time_mk):
+        """ It should only synchronize metadata once within the TTL """
+        time_mk.time.return_value = 1000
+        with mock.patch.object(
+            self.Model.__class__, 'synchronize_metadata',
+        ) as mk:
+            with mock.patch.object(self.env.cr, 'after') as after:
+                after.side_effect = self._commit_after
+                self.backend.check_carepoint_structure()
+                time_mk.time.return_value += METADATA_SYNC_TTL - 1
+                self.backend.check_carepoint_structure()
+            mk.assert_called_once_with()
+
+    @mock.patch('%s.time' % model)
+    def test_check_carepoint_structure_expired(self, time_mk):
+        """ It should synchronize metadata again after the TTL """
+        time_mk.time.return_value = 1000
+        with mock.patch.object(
+            self.Model.__class__, 'synchronize_metadata',
+        ) as mk:
+            with mock.patch.object(self.env.cr, 'after') as after:
+                after.side_effect = self._commit_after
+                self.backend.check_carepoint_structure()
+                time_mk.time.return_value += METADATA_SYNC_TTL
+                self.backend.check_carepoint_structure()
+            self.assertEqual(2, mk.call_count)
+
+    @mock.patch('%s.time' % model)
+    def test_check_carepoint_structure_not_committed(self, time_mk):
+        """ It should synchronize metadata again if not yet committed """
+        time_mk.time.return_value = 1000
+        with mock.patch.object(
+            self.Model.__class__, 'synchronize_metadata',
+        ) as mk:
+            with mock.patch.object(self.env.cr, 'after') as after:
+                self.backend.check_carepoint_structure()
+                self.backend.check_carepoint_structure()
+                after.assert_called_with('commit', mock.ANY)
+            self.assertEqual(2, mk.call_count)
+
     @mock.patch('%s.import_batch' % model)
     @mock.patch('%s.ConnectorSession' % model)
     def test_import_all_checks_stucture(self, session, batch):
@@ -68,6 +161,16 @@ class TestCarepointBackend(SetUpCarepointBase):
             session(), expect, self.backend.id,
         )
 
+    @mock.patch('%s.import_batch' % model)
+    @mock.patch('%s.ConnectorSession' % model)
+    def test_import_all_calls_import_models(self, session, batch):
+        """ It should delay a batch import for each model """
+        self.backend._import_all('model1', 'model2')
+        batch.delay.assert_has_calls([
+            mock.call(session(), 'model1', self.backend.id),
+            mock.call(session(), 'model2', self.backend.id),
+        ])
+
     @mock.patch('%s.import_batch' % model)
     @mock.patch('%s.ConnectorSession' % model)
     def test_import_from_date_checks_stucture(self, session, batch):
@@ -124,11 +227,64 @@ class TestCarepointBackend(SetUpCarepointBase):
             self.backend.import_patients_from_date,
         )
 
+    @mock.patch('%s.import_records' % model)
+    @mock.patch('%s.ConnectorSession' % model)
+    def test_resync_all_groups_by_backend(self, session, records):
+        """ It should delay one bulk import per backend """
+        binding_model = 'carepoint.carepoint.address'
+        Binding = self.env[binding_model].__class__
+        with mock.patch.object(Binding, 'search_read') as search_read:
+            search_read.return_value = [
+                {'backend_id': (1, 'Backend 1'), 'carepoint_id': '10'},
+                {'backend_id': (2, 'Backend 2'), 'carepoint_id': '20'},
+                {'backend_id': (1, 'Backend 1'), 'carepoint_id': '11'},
+            ]
+            self.Model.resync_all(binding_model)
+            records.delay.assert_has_calls([
+                mock.call(session(), binding_model, 1, ['10', '11'],
+                          force=True),
+                mock.call(session(), binding_model, 2, ['20'],
+                          force=True),
+            ], any_order=True)
+            self.assertEqual(2, records.delay.call_count)
+
+    @mock.patch('%s.import_records' % model)
+    @mock.patch('%s.ConnectorSession' % model)
+    def test_resync_all_skips_unbound(self, session, records):
+        """ It should only read bindings that have a Carepoint ID """
+        binding_model = 'carepoint.carepoint.address'
+        Binding = self.env[binding_model].__class__
+        with mock.patch.object(Binding, 'search_read') as search_read:
+            search_read.return_value = []
+            self.Model.resync_all(binding_model)
+            search_read.assert_called_once_with(
+                [('carepoint_id', '!=', False)],
+                ['backend_id', 'carepoint_id'],
+            )
+
+    @mock.patch('%s.import_records' % model)
+    @mock.patch('%s.ConnectorSession' % model)
+    def test_force_sync_single(self, session, records):
+        """ It should delay a bulk import for a single primary key """
+        self.Model.force_sync('model', 123, self.backend.id)
+        records.delay.assert_called_once_with(
+            session(), 'model', self.backend.id, [123], force=True,
+        )
+
+    @mock.patch('%s.import_records' % model)
+    @mock.patch('%s.ConnectorSession' % model)
+    def test_force_sync_list(self, session, records):
+        """ It should delay a single bulk import for a list of keys """
+        self.Model.force_sync('model', ['1', '2'], self.backend.id)
+        records.delay.assert_called_once_with(
+            session(), 'model', self.backend.id, ['1', '2'], force=True,
+        )
+
     def test_cron_import_medical_prescription_search(self):
-        """ It should search for all backends """
+        """ It should search for active backends """
         with mock.patch.object(self.backend, 'search') as mk:
             self.backend.cron_import_medical_prescription()
-            mk.assert_called_once_with([])
+            mk.assert_called_once_with([('active', '=', True)])
 
     def test_cron_import_medical_prescription_import(self):
         """ It should call import on found backends """
@@ -137,10 +293,10 @@ class TestCarepointBackend(SetUpCarepointBase):
             mk().import_medical_prescription.assert_called_once_with()
 
     def test_cron_import_medical_patient_search(self):
-        """ It should search for all backends """
+        """ It should search for active backends """
         with mock.patch.object(self.backend, 'search') as mk:
             self.backend.cron_import_medical_patient()
-            mk.assert_called_once_with([])
+            mk.assert_called_once_with([('active', '=', True)])
 
     def test_cron_import_medical_patient_import(self):
         """ It should call import on found backends """
@@ -149,10 +305,10 @@ class TestCarepointBackend(SetUpCarepointBase):
             mk().import_medical_patient.assert_called_once_with()
 
     def test_cron_import_medical_physician_search(self):
-        """ It should search for all backends """
+        """ It should search for active backends """
         with mock.patch.object(self.backend, 'search') as mk:
             self.backend.cron_import_medical_physician()
-            mk.assert_called_once_with([])
+            mk.assert_called_once_with([('active', '=', True)])
 
     def test_cron_import_medical_physician_import(self):
         """ It should call import on found backends """
@@ -161,10 +317,10 @@ class TestCarepointBackend(SetUpCarepointBase):
             mk().import_medical_physician.assert_called_once_with()
 
     def test_cron_import_address_search(self):
-        """ It should search for all backends """
+        """ It should search for active backends """
         with mock.patch.object(self.backend, 'search') as mk:
             self.backend.cron_import_address()
-            mk.assert_called_once_with([])
+            mk.assert_called_once_with([('active', '=', True)])
 
     def test_cron_import_address_import(self):
         """ It should call import on found backends """
@@ -173,10 +329,10 @@ class TestCarepointBackend(SetUpCarepointBase):
             mk().import_address.assert_called_once_with()
 
     def test_cron_import_sale_order_search(self):
-        """ It should search for all backends """
+        """ It should search for active backends """
         with mock.patch.object(self.backend, 'search') as mk:
             self.backend.cron_import_sale_order()
-            mk.assert_called_once_with([])
+            mk.assert_called_once_with([('active', '=', True)])
 
     def test_cron_import_sale_order_import(self):
         """ It should call import on found backends """
@@ -276,8 +432,8 @@ class TestCarepointBackend(SetUpCarepointBase):
         """ It should import all of the required FDB models """
         with mock.patch.object(self.backend, '_import_all') as mk:
             self.backend.import_fdb()
-            mk.assert_has_calls([
-                mock.call('carepoint.fdb.route'),
-                mock.call('carepoint.fdb.form'),
-                mock.call('carepoint.fdb.unit'),
-            ])
+            mk.assert_called_once_with(
+                'carepoint.fdb.route',
+                'carepoint.fdb.form',
+                'carepoint.fdb.unit',
+            )
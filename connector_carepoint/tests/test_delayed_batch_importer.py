@@ -11,6 +11,10 @@ from .common import SetUpCarepointBase
 model = 'odoo.addons.connector_carepoint.unit.import_synchronizer'
 
 
+class EndTestException(Exception):
+    pass
+
+
 class TestDelayedBatchImporter(SetUpCarepointBase):
 
     def setUp(self):
@@ -44,3 +48,68 @@ class TestDelayedBatchImporter(SetUpCarepointBase):
                     int_or_str(expect),
                     **kwargs
                 )
+
+    def test_run_chunks(self):
+        """ It should import the search results in chunks """
+        importer = self._new_importer()
+        record_ids = range(import_synchronizer.BATCH_SIZE + 1)
+        with self.mock_adapter(importer):
+            importer.backend_adapter.search.return_value = record_ids
+            with mock.patch.object(importer, '_import_records') as mk:
+                importer.run()
+                mk.assert_has_calls([
+                    mock.call(record_ids[:-1]),
+                    mock.call(record_ids[-1:]),
+                ])
+
+    def test_import_records(self):
+        """ It should call import_records w/ proper args """
+        importer = self._new_importer()
+        expect = ['1', '2']
+        kwargs = {'force': True}
+        with mock.patch('%s.import_records' % model) as mk:
+            importer._import_records(expect, **kwargs)
+            mk.delay.assert_called_once_with(
+                importer.session,
+                importer.model._name,
+                importer.backend_record.id,
+                [1, 2],
+                **kwargs
+            )
+
+    @mock.patch('%s.get_environment' % model)
+    def test_import_records_job_runs(self, env):
+        """ It should run the importer for each record """
+        import_synchronizer.import_records(
+            self.session, self.model, self.backend.id, [1, 2], force=True,
+        )
+        env().get_connector_unit().run.assert_has_calls([
+            mock.call(1, force=True),
+            mock.call(2, force=True),
+        ])
+
+    @mock.patch('%s.import_record' % model)
+    @mock.patch('%s.get_environment' % model)
+    def test_import_records_job_delays_failed(self, env, import_record):
+        """ It should delay a single import for failed records """
+        env().get_connector_unit().run.side_effect = [
+            EndTestException, None,
+        ]
+        import_synchronizer.import_records(
+            self.session, self.model, self.backend.id, [1, 2],
+        )
+        import_record.delay.assert_called_once_with(
+            self.session, self.model, self.backend.id, 1, force=False,
+        )
+
+    @mock.patch('%s.import_record' % model)
+    @mock.patch('%s.get_environment' % model)
+    def test_import_records_job_invalidates_cache(self, env, import_record):
+        """ It should invalidate the ORM cache after a failed record """
+        env().get_connector_unit().run.side_effect = EndTestException
+        Environment = self.session.env.__class__
+        with mock.patch.object(Environment, 'invalidate_all') as mk:
+            import_synchronizer.import_records(
+                self.session, self.model, self.backend.id, [1],
+            )
+            mk.assert_called_once_with()
@@ -44,6 +44,18 @@ class TestMapper(SetUpCarepointBase):
             rec['str'].strip().title(), res
         )
 
+    def test_trim_and_titleize_unicode(self):
+        """ It should not encode unicode values to str """
+        modifier = mapper.trim_and_titleize('str')
+        res = modifier(False, {'str': u' \xe9cole street '}, False)
+        self.assertEqual(u'\xc9cole Street', res)
+
+    def test_trim_and_titleize_not_string(self):
+        """ It should convert non string values to str """
+        modifier = mapper.trim_and_titleize('int')
+        res = modifier(False, {'int': 123}, False)
+        self.assertEqual('123', res)
+
     def test_trim_and_titleize_false(self):
         """ It should return False no field in record """
         modifier = mapper.trim_and_titleize('no_exist')
@@ -2,6 +2,8 @@
 # Copyright 2015-2016 LasLabs Inc.
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+import base64
+
 from odoo.addons.connector.unit.backend_adapter import CRUDAdapter
 
 try:
@@ -35,7 +37,8 @@ class CarepointCRUDAdapter(CRUDAdapter):
             server=backend.server,
             user=backend.username,
             passwd=backend.password,
-            db_args={'drv': backend.db_driver},
+            db_args=dict(backend._get_engine_args(),
+                         drv=backend.db_driver),
         )
 
     def __to_camel_case(self, snake_case):
@@ -105,7 +108,7 @@ class CarepointCRUDAdapter(CRUDAdapter):
         Returns:
             :type:`str` Base64 encoded binary file
         """
-        return self.carepoint.get_file(path).read().encode('base64')
+        return base64.b64encode(self.carepoint.get_file(path).read())
 
     def write_image(self, path, file_obj):
         """ Write a file-like object to CarePoint SMB resource
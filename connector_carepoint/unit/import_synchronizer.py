@@ -23,6 +23,14 @@ from ..connector import get_environment, add_checkpoint
 
 _logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 500  # records imported per delayed batch job
+
+
+def iter_chunks(items, size=BATCH_SIZE):
+    """ Yield successive chunks of ``size`` items from a list """
+    for idx in range(0, len(items), size):
+        yield items[idx:idx + size]
+
 
 def int_or_str(val):
     try:
@@ -234,6 +242,10 @@ class BatchImporter(Importer):
         record_ids = self.backend_adapter.search(**filters)
         _logger.info('Search for carepoint companies %s returned %s\n',
                      filters, record_ids)
+        self._import_record_ids(record_ids)
+
+    def _import_record_ids(self, record_ids):
+        """ Import every record id found by the search """
         for record_id in record_ids:
             _logger.info('In record loop with %s', record_id)
             self._import_record(record_id)
@@ -258,9 +270,25 @@ class DirectBatchImporter(BatchImporter):
 
 
 class DelayedBatchImporter(BatchImporter):
-    """ Delay import of the records """
+    """ Delay import of the records
+    Records are grouped into chunks of ``BATCH_SIZE`` and one job is
+    delayed per chunk, rather than one job per record.
+    """
     _model_name = None
 
+    def _import_record_ids(self, record_ids):
+        """ Delay one import job per chunk of record ids """
+        for chunk in iter_chunks(record_ids):
+            self._import_records(chunk)
+
+    def _import_records(self, record_ids, **kwargs):
+        """ Delay the import of a chunk of records in a single job """
+        import_records.delay(self.session,
+                             self.model._name,
+                             self.backend_record.id,
+                             [int_or_str(r) for r in record_ids],
+                             **kwargs)
+
     def _import_record(self, record_id, **kwargs):
         """ Delay the import of the records"""
         import_record.delay(self.session,
@@ -311,3 +339,28 @@ def import_record(session, model_name, backend_id, carepoint_id, force=False):
     importer = env.get_connector_unit(CarepointImporter)
     _logger.debug('Importing CP Record %s from %s', carepoint_id, model_name)
     importer.run(carepoint_id, force=force)
+
+
+@job(default_channel='root.carepoint')
+def import_records(session, model_name, backend_id, carepoint_ids,
+                   force=False):
+    """ Import a batch of records from Carepoint in one job
+    Each record is imported in its own savepoint. A record that fails is
+    rolled back alone and delayed as a single ``import_record`` job, so
+    the rest of the batch is still committed.
+    """
+    env = get_environment(session, model_name, backend_id)
+    importer = env.get_connector_unit(CarepointImporter)
+    _logger.debug('Importing %d CP Records from %s',
+                  len(carepoint_ids), model_name)
+    for carepoint_id in carepoint_ids:
+        try:
+            with session.env.cr.savepoint():
+                importer.run(carepoint_id, force=force)
+        except Exception:
+            _logger.exception('Delaying failed import of CP Record %s '
+                              'from %s', carepoint_id, model_name)
+            # The savepoint only rolls back SQL, drop the cached values too
+            session.env.invalidate_all()
+            import_record.delay(session, model_name, backend_id,
+                                carepoint_id, force=force)
@@ -37,7 +37,9 @@ def trim_and_titleize(field):
         value = record.get(field)
         if not value:
             return False
-        return str(value).strip().title()
+        if not isinstance(value, basestring):
+            value = str(value)
+        return value.strip().title()
     return modifier
 
 